@@ -6,6 +6,7 @@
 
 import streamlit as st  # For creating the web interface
 import pandas as pd  # For working with data in tables (DataFrames)
+import numpy as np  # For fast work with arrays of numbers
 
 
 # ============================================================================
@@ -20,79 +21,368 @@ st.set_page_config(
     layout="wide"
 )
 
+# A random number generator for this script run
+# np.random.default_rng() is NumPy's recommended way to get random numbers
+# Streamlit reruns this whole file on every full rerun, so a new generator
+# is made each time - it is not shared across runs or sessions
+# It is used to shuffle the questions and to pick a seed when
+# generate_quiz() isn't given one
+rng = np.random.default_rng()
+
 
 # ============================================================================
 # FUNCTION DEFINITIONS
 # ============================================================================
 
+@st.cache_data(ttl=None)
 def load_questions():
     """
-    Load questions from CSV file
+    Load questions from the Parquet file
 
     Returns:
-        DataFrame: All questions from the CSV file
+        DataFrame: All questions from the question bank
 
     Why a function?
     - Separates the "what" (loading data) from "when" (we'll use it later)
     - Makes code reusable - can call this multiple times
     - Easier to test and debug
+
+    Why @st.cache_data?
+    - Streamlit remembers the returned DataFrame for the server's lifetime
+    - Every new user session reuses it instead of re-reading the file
+    - Each caller gets its own copy, so nobody can change the cached data
+
+    Why Parquet instead of CSV?
+    - A CSV is plain text that has to be split up and converted on every load
+    - Parquet already stores each column with its type, so loading is fast
+    - quiz_questions.csv is still the file to edit; after changing it, rebuild
+      the Parquet file with:
+          df = pd.read_csv("quiz_questions.csv")
+          df['difficulty'] = df['difficulty'].astype("category")
+          df.to_parquet("quiz_questions.parquet", index=False)
     """
-    df = pd.read_csv("quiz_questions.csv")
+    # Only the columns the quiz actually uses (e.g. 'topic' is never shown)
+    # Parquet stores each column separately, so the rest are never even read
+    columns = [
+        "question",
+        "option_a",
+        "option_b",
+        "option_c",
+        "option_d",
+        "correct_answer",
+        "difficulty",
+    ]
+
+    # engine="pyarrow" reads the file with fast native code
+    # dtype_backend="pyarrow" stores text columns as compact Arrow strings
+    df = pd.read_parquet(
+        "quiz_questions.parquet",
+        columns=columns,
+        engine="pyarrow",
+        dtype_backend="pyarrow"
+    )
+
+    # 'difficulty' only has a few distinct values (easy, medium, medium+)
+    # Storing it as a category makes filtering on it much cheaper
+    df['difficulty'] = df['difficulty'].astype("category")
     return df
 
 
-def generate_quiz(df, num_easy=4, num_medium=4, num_hard=4):
+@st.cache_data(ttl=None)
+def get_index_pools(df):
     """
-    Generate quiz with specified distribution of difficulties
+    Find the row positions of the questions for each difficulty
 
     Args:
         df: DataFrame containing all available questions
+
+    Returns:
+        dict: Maps each difficulty ('easy', 'medium', 'medium+') to a NumPy
+              array with the row positions of its questions
+
+    Why cache this?
+    - The questions never change while the app is running
+    - So we only need to look through the 'difficulty' column once
+    - Every quiz after that just picks from these ready-made lists
+    """
+    difficulties = df['difficulty'].to_numpy()
+
+    # np.flatnonzero() returns the positions where the condition is True
+    return {
+        difficulty: np.flatnonzero(difficulties == difficulty)
+        for difficulty in ("easy", "medium", "medium+")
+    }
+
+
+def generate_quiz(num_easy=4, num_medium=4, num_hard=4, seed=None):
+    """
+    Generate quiz with specified distribution of difficulties
+
+    Args:
         num_easy: How many easy questions to include (default: 4)
         num_medium: How many medium questions to include (default: 4)
         num_hard: How many medium+ questions to include (default: 4)
+        seed: Number that decides which questions are picked (default: None)
+              The same seed always gives the same quiz
+              With no seed, a random one is picked, so every call differs
+
+    Returns:
+        dict: Selected and shuffled quiz questions, one list per column
+              e.g. quiz['question'][0] is the text of the first question
+
+    Why is the seed picked HERE and not in _generate_quiz()?
+    - _generate_quiz() is cached on its arguments
+    - If None reached it, None would be the cache key, and every caller
+      without a seed would get back the very first quiz forever
+    """
+    if seed is None:
+        seed = int(rng.integers(2**32))
+    return _generate_quiz(num_easy, num_medium, num_hard, seed)
+
+
+@st.cache_data(ttl=None, max_entries=1000)
+def _generate_quiz(num_easy, num_medium, num_hard, seed):
+    """
+    Build the quiz for one set of counts and one seed (see generate_quiz())
+
+    Args:
+        num_easy: How many easy questions to include
+        num_medium: How many medium questions to include
+        num_hard: How many medium+ questions to include
+        seed: Number that decides which questions are picked
 
     Returns:
-        DataFrame: Selected and shuffled quiz questions
+        dict: Selected and shuffled quiz questions, one list per column
+
+    Why @st.cache_data?
+    - The quiz only depends on the counts and the seed
+    - So asking again with the same seed hands back the saved quiz
+    - max_entries=1000 stops the cache from growing forever
 
     How it works:
-    1. Filter questions by difficulty level
-    2. Randomly sample the requested number from each difficulty
-    3. Combine all selected questions
+    1. Load the questions and look up the row positions for each difficulty (cached)
+    2. Randomly pick the requested number of positions from each difficulty
+    3. Combine all selected positions
     4. Shuffle them so they're not grouped by difficulty
-    5. Add question numbers
+    5. Grab those rows in one go and keep just their columns as plain lists
     """
 
-    # STEP 1: Filter and sample easy questions
-    # df[df['difficulty'] == 'easy'] filters for only easy questions
-    # .sample(n=X) randomly picks X questions from those
+    # STEP 1: Get the questions and the row positions for each difficulty
+    # Both are cached, so they are only computed once per server
+    df = load_questions()
+    pools = get_index_pools(df)
+
+    # A random number generator just for this quiz, started from the seed
+    rng = np.random.default_rng(seed)
+
+    # STEP 2: Randomly pick row positions from each difficulty
+    # rng.choice(..., replace=False) picks without repeating a question
+    easy = rng.choice(pools["easy"], size=num_easy, replace=False)
+    medium = rng.choice(pools["medium"], size=num_medium, replace=False)
+    hard = rng.choice(pools["medium+"], size=num_hard, replace=False)
+
+    # STEP 3: Combine all selected positions into one array
+    selected = np.concatenate([easy, medium, hard])
+
+    # STEP 4: Shuffle the positions randomly (in place)
+    # Each pick above is already random, so one shuffle of these 12 numbers
+    # is all it takes to mix the difficulties - no second pass over the rows
+    rng.shuffle(selected)
+
+    # STEP 5: Grab the selected rows and turn each column into a plain list
+    # .iloc[] with an array of positions builds the quiz in a single step
+    # We don't store question numbers: "Question X of Y" is worked out
+    # from current_question when it's displayed
+    selected_df = df.iloc[selected]
+
+    # e.g. {'question': ['...', '...', ...], 'option_a': ['...', ...], ...}
+    # Looking up quiz['question'][i] is much cheaper than quiz.iloc[i],
+    # and Streamlit does that lookup on every single rerun.
+    # Only these few short lists are kept in the session, not the DataFrame.
+    columns = ["question", "option_a", "option_b", "option_c", "option_d", "correct_answer"]
+    return {column: selected_df[column].tolist() for column in columns}
+
+
+# ----------------------------------------------------------------------------
+# Button callbacks
+# ----------------------------------------------------------------------------
+#
+# Each button below is given one of these with on_click=...
+# Streamlit calls it BEFORE rerunning, so by the time anything is drawn,
+# session_state already holds the new values - no st.rerun() needed.
 
-    easy = df[df['difficulty'] == 'easy'].sample(n=4)
+def _shuffle():
+    """Shuffle the quiz and go back to the first question"""
+    quiz = st.session_state.quiz
 
+    # rng.permutation() gives the question positions in a random order
+    # We reorder every column the same way so each question keeps its options
+    order = rng.permutation(len(quiz['question']))
+    for column, values in quiz.items():
+        quiz[column] = [values[i] for i in order]
+
+    # Reset to first question and hide the answer
+    st.session_state.current_question = 0
+    st.session_state.show_answer = False
+
+
+def _show():
+    """Reveal the answer to the current question"""
+    st.session_state.show_answer = True
+
+
+def _hide():
+    """Hide the answer to the current question"""
+    st.session_state.show_answer = False
 
-    # STEP 2: Filter and sample medium questions
-    # Same process as easy questions
-    medium = df[df['difficulty'] == 'medium'].sample(n=4)
 
-    # STEP 3: Filter and sample hard (medium+) questions
-    # Same process, but filtering for 'medium+' difficulty
-    hard = df[df['difficulty'] == 'medium+'].sample(n=4)
+def _prev():
+    """Move back one question and hide the answer"""
+    st.session_state.current_question -= 1
+    st.session_state.show_answer = False
+
 
-    # STEP 4: Combine all selected questions into one DataFrame
-    # pd.concat() stacks DataFrames vertically
-    # ignore_index=True creates new row numbers starting from 0
-    quiz = pd.concat([easy, medium, hard])
+def _next():
+    """Move forward one question and hide the answer"""
+    st.session_state.current_question += 1
+    st.session_state.show_answer = False
 
-    # STEP 5: Shuffle the questions randomly
-    # .sample(frac=1) means sample 100% of the rows in random order
-    # .reset_index(drop=True) resets row numbers after shuffling
-    quiz = quiz.sample(frac=1)
 
-    # STEP 6: Add question numbers (1, 2, 3, ...)
-    # range(1, len(quiz) + 1) creates numbers from 1 to total_questions
-    # We store this in a new column called 'question_num'
-    quiz['question_num'] = range(1, len(quiz) + 1)
+@st.fragment
+def answer_panel(correct_answer):
+    """
+    Show the Show/Hide Answer buttons and, when asked, the correct answer
 
-    return quiz
+    Args:
+        correct_answer: The right answer for the current question (A, B, C, or D)
+
+    Why @st.fragment?
+    - Normally every button click reruns the WHOLE script
+    - Clicking a button inside a fragment only reruns this function
+    - So toggling the answer doesn't redraw the navigation or the question
+    """
+    # Two small buttons side by side, with empty space to their right
+    col1, col2, _ = st.columns([1, 1, 3])
+
+    # COLUMN 1: Show Answer button
+    with col1:
+        st.button("Show Answer", use_container_width=True, on_click=_show)
+
+    # COLUMN 2: Hide Answer button
+    with col2:
+        st.button("Hide Answer", use_container_width=True, on_click=_hide)
+
+    # Conditional rendering: Only show answer when flag is True
+    if st.session_state.show_answer:
+        # st.success() creates a green success message box
+        # We use **bold** formatting with markdown
+        st.success(f"**Correct Answer: {correct_answer}**")
+
+
+def render_question(quiz, i):
+    """
+    Draw a question and its four options
+
+    Args:
+        quiz: The quiz from session_state (one list per column)
+        i: Position of the question to draw (0 = first question)
+    """
+    # We use f-string to insert the question from our data
+    #
+    # Everything goes into ONE st.markdown() call, which sends a single message
+    # to the browser instead of five. The blank lines ("\n\n") between entries
+    # keep each option on its own line.
+    st.markdown(
+        f"{quiz['question'][i]}\n\n"
+        f"A. {quiz['option_a'][i]}\n\n"
+        f"B. {quiz['option_b'][i]}\n\n"
+        f"C. {quiz['option_c'][i]}\n\n"
+        f"D. {quiz['option_d'][i]}"
+    )
+
+
+@st.fragment
+def question_panel():
+    """
+    Show the navigation, the current question and its answer panel
+
+    Why @st.fragment?
+    - Clicking Previous or Next only reruns this function
+    - The title and the Shuffle button above are left as they are
+    """
+
+    # Accessing the current question data
+    #
+    # The quiz is a dict with one list per column, e.g.
+    # quiz['question'][i] = the question text
+    # quiz['option_a'][i] = first answer choice
+    # quiz['correct_answer'][i] = the right answer (A, B, C, or D)
+    # etc.
+    #
+    # i is the current question index (0 = first question, 1 = second, ...)
+    quiz = st.session_state.quiz
+    i = st.session_state.current_question
+
+    # How many questions are in the quiz (12 with the default settings)
+    total = len(quiz['question'])
+
+    # ------------------------------------------------------------------------
+    # NAVIGATION BUTTONS
+    # ------------------------------------------------------------------------
+
+    # Navigation: Previous and Next buttons to move between questions
+    #
+    # Layout: [Previous] [question counter] [Next]
+    # The middle column is 3x wider to create space between buttons
+
+    col1, col2, col3 = st.columns([1, 3, 1])
+
+    # COLUMN 1: Previous button
+    with col1:
+        # Create Previous button
+        # disabled=True makes the button unclickable when condition is met
+        # We disable when current_question == 0 (already at first question)
+        st.button(
+            "Previous",
+            use_container_width=True,
+            disabled=(i == 0),
+            on_click=_prev
+        )
+
+    # COLUMN 2: Question counter
+    with col2:
+        # Display which question we're on and total questions
+        # We add 1 to i because it's 0-indexed (0, 1, 2...)
+        # but we want to show users (1, 2, 3...)
+        st.subheader(f"Question {i + 1} of {total}")
+
+    # COLUMN 3: Next button
+    with col3:
+        # Create Next button
+        # Disable when we're at the last question
+        # total - 1 because the quiz has 12 questions, but last index is 11
+        st.button(
+            "Next",
+            use_container_width=True,
+            disabled=(i == total - 1),
+            on_click=_next
+        )
+
+    # ------------------------------------------------------------------------
+    # CURRENT QUESTION
+    # ------------------------------------------------------------------------
+
+    # Display the question text and the four answer options
+    render_question(quiz, i)
+
+    # ------------------------------------------------------------------------
+    # SHOW ANSWER
+    # ------------------------------------------------------------------------
+
+    # The Show/Hide Answer buttons and the green answer box
+    # answer_panel() is its own fragment, so toggling the answer only
+    # reruns that small part
+    answer_panel(quiz['correct_answer'][i])
 
 
 # ============================================================================
@@ -111,26 +401,30 @@ def generate_quiz(df, num_easy=4, num_medium=4, num_hard=4):
 
 # Check if 'quiz' exists in session state
 # This will be False the first time the app runs
+#
+# We keep this one check (instead of st.session_state.setdefault(...)) because
+# setdefault would build a brand new quiz on EVERY rerun just to throw it away.
 if 'quiz' not in st.session_state:
-    # First run: Load questions and generate quiz
-    df_questions = load_questions()
-
-    # Generate the quiz with our desired distribution
-    # We store it in session_state so it persists across button clicks
-    st.session_state.quiz = generate_quiz(
-        df_questions,
-        num_easy=4,  # 4 easy questions
-        num_medium=4,  # 4 medium questions
-        num_hard=4  # 4 hard questions
+    # First run: set all our starting values together in one .update() call
+    # .update() works just like it does on a normal Python dictionary:
+    # it still assigns each key one by one, it just keeps them in one place
+    st.session_state.update(
+        # Generate the quiz with our desired distribution
+        # We store it in session_state so it persists across button clicks
+        quiz=generate_quiz(
+            num_easy=4,  # 4 easy questions
+            num_medium=4,  # 4 medium questions
+            num_hard=4  # 4 hard questions
+        ),
+
+        # Whether to show the answer (start with hidden)
+        show_answer=False,
+
+        # Which question we're currently showing (start at 0 = first question)
+        # We use 0-based indexing because that's how Python lists work
+        current_question=0,
     )
 
-    # Initialize whether to show the answer (start with hidden)
-    st.session_state.show_answer = False
-
-    # Initialize which question we're currently showing (start at 0 = first question)
-    # We use 0-based indexing because that's how DataFrames work
-    st.session_state.current_question = 0
-
 # ============================================================================
 # USER INTERFACE - TITLE SECTION
 # ============================================================================
@@ -147,165 +441,32 @@ st.markdown("---")
 
 # Layout Strategy: Using columns for side-by-side elements
 #
-# st.columns([2, 1, 1, 1]) creates 4 columns with relative widths:
-# - Column 1: width = 2 (twice as wide as others)
-# - Columns 2, 3, 4: width = 1 each
+# st.columns([4, 1]) creates 2 columns with relative widths:
+# - Column 1: width = 4 (four times as wide as the other), left empty
+# - Column 2: width = 1
 #
-# This puts the question counter on the left, buttons on the right.
+# This puts the Shuffle button on the right.
+# The question counter sits between Previous and Next in question_panel().
 
-col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+col1, col2 = st.columns([4, 1])
 
-# COLUMN 1: Question counter
-with col1:
-    # Display which question we're on and total questions
-    # We add 1 to current_question because it's 0-indexed (0, 1, 2...)
-    # but we want to show users (1, 2, 3...)
-    st.subheader(f"Question {st.session_state.current_question + 1} of {len(st.session_state.quiz)}")
-
-# COLUMN 2: Shuffle button
+# COLUMN 2: Shuffle button (column 1 is empty for spacing)
 with col2:
     # Create a button that shuffles questions
     # use_container_width=True makes button fill the column width
-    if st.button("Shuffle Questions", use_container_width=True):
-        # Get the current quiz from session state
-        quiz = st.session_state.quiz
-
-        # Shuffle it: .sample(frac=1) randomly reorders all rows
-        quiz = quiz.sample(frac=1).reset_index(drop=True)
-
-        # Renumber the questions 1, 2, 3... after shuffling
-        quiz['question_num'] = range(1, len(quiz) + 1)
-
-        # Save the shuffled quiz back to session state
-        st.session_state.quiz = quiz
-
-        # Reset to first question after shuffling
-        st.session_state.current_question = 0
-
-        # Hide answer when we shuffle
-        st.session_state.show_answer = False
-
-        # st.rerun() forces Streamlit to rerun the script
-        # This updates the display with our changes
-        st.rerun()
-
-# COLUMN 3: Show Answer button
-with col3:
-    if st.button("Show Answer", use_container_width=True):
-        # Set flag to True - will display answer below
-        st.session_state.show_answer = True
-        st.rerun()  # Refresh to show the answer
-
-# COLUMN 4: Hide Answer button
-with col4:
-    if st.button("Hide Answer", use_container_width=True):
-        # Set flag to False - will hide answer below
-        st.session_state.show_answer = False
-        st.rerun()  # Refresh to hide the answer
+    # on_click=_shuffle runs the shuffle before the script reruns
+    st.button("Shuffle Questions", use_container_width=True, on_click=_shuffle)
 
 # Another horizontal divider
 st.markdown("---")
 
 # ============================================================================
-# USER INTERFACE - NAVIGATION BUTTONS
-# ============================================================================
-
-# Navigation: Previous and Next buttons to move between questions
-#
-# Layout: [Previous] [empty space] [Next]
-# The middle column is 3x wider to create space between buttons
-
-col1, col2, col3 = st.columns([1, 3, 1])
-
-# COLUMN 1: Previous button
-with col1:
-    # Create Previous button
-    # disabled=True makes the button unclickable when condition is met
-    # We disable when current_question == 0 (already at first question)
-    if st.button(
-            "Previous",
-            use_container_width=True,
-            disabled=(st.session_state.current_question == 0)
-    ):
-        # Move back one question (subtract 1 from index)
-        st.session_state.current_question -= 1
-
-        # Hide answer when changing questions
-        st.session_state.show_answer = False
-
-        st.rerun()  # Refresh to show the previous question
-
-# COLUMN 3: Next button (column 2 is empty for spacing)
-with col3:
-    # Create Next button
-    # Disable when we're at the last question
-    # len(quiz) - 1 because quiz has length 12, but last index is 11
-    if st.button(
-            "Next",
-            use_container_width=True,
-            disabled=(st.session_state.current_question == len(st.session_state.quiz) - 1)
-    ):
-        # Move forward one question (add 1 to index)
-        st.session_state.current_question += 1
-
-        # Hide answer when changing questions
-        st.session_state.show_answer = False
-
-        st.rerun()  # Refresh to show the next question
-
-# ============================================================================
-# DISPLAY CURRENT QUESTION
+# USER INTERFACE - QUESTION, NAVIGATION AND ANSWER
 # ============================================================================
 
-# Accessing the current question data
-#
-# We need to:
-# 1. Get the quiz DataFrame from session state
-# 2. Get the current question index
-# 3. Use .iloc[] to get that specific row
-
-# Get the full quiz DataFrame
-quiz = st.session_state.quiz
-
-# Get the current question as a Series (single row from DataFrame)
-# .iloc[] accesses by position (0 = first row, 1 = second row, etc.)
-current = quiz.iloc[st.session_state.current_question]
-
-# Now 'current' contains all the data for this question:
-# current['question'] = the question text
-# current['option_a'] = first answer choice
-# current['correct_answer'] = the right answer (A, B, C, or D)
-# etc.
-
-# ============================================================================
-# DISPLAY QUESTION AND OPTIONS
-# ============================================================================
-
-# Display the question text
-# We use f-string to insert the question from our data
-st.markdown(f"{current['question']}")
-
-# Display the four answer options
-# Each gets its own line
-st.markdown(f"A. {current['option_a']}")
-st.markdown(f"B. {current['option_b']}")
-st.markdown(f"C. {current['option_c']}")
-st.markdown(f"D. {current['option_d']}")
-
-# ============================================================================
-# CONDITIONAL DISPLAY - SHOW ANSWER
-# ============================================================================
-
-# Conditional rendering: Only show answer when flag is True
-#
-# This is controlled by the "Show Answer" and "Hide Answer" buttons above.
-# When show_answer is True, we display the correct answer in a green box.
-
-# Check if we should show the answer
-if st.session_state.show_answer:
-    # st.success() creates a green success message box
-    # We use **bold** formatting with markdown
-    st.success(f"**Correct Answer: {current['correct_answer']}**")
+# question_panel() is a fragment: clicking Previous, Next, Show Answer or
+# Hide Answer only reruns that part of the page, not this whole script.
+question_panel()
 
 # ============================================================================
 # FOOTER
@@ -313,4 +474,3 @@ if st.session_state.show_answer:
 
 # Final horizontal divider at bottom
 st.markdown("---")
-